@@ -2,10 +2,17 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable, Mapping
 from enum import Enum
-from typing import Optional
+from pathlib import Path
+from typing import Any, Optional, Self
 
-from pydantic import BaseModel
+import yaml
+from pydantic import BaseModel, ConfigDict, PrivateAttr, model_validator
+
+# libyaml-backed loader/dumper when PyYAML was built with it
+_YAMLLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YAMLDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
 
 
 class AcceleratorType(str, Enum):
@@ -17,14 +24,12 @@ class AcceleratorType(str, Enum):
 
 
 class Accelerator(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     type: AcceleratorType
     model: str
     count: int = 1
     vram_gb: Optional[float] = None
-    # Runtime state
-    utilization_pct: Optional[float] = None
-    memory_used_gb: Optional[float] = None
-    temperature_c: Optional[float] = None
 
 
 class Capability(str, Enum):
@@ -41,15 +46,18 @@ class Capability(str, Enum):
 class ServiceEndpoint(BaseModel):
     """A running service on a node (e.g., vLLM, Triton, Whisper)."""
 
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     name: str
     port: int
     protocol: str = "http"
     models: list[str] = []
-    healthy: bool = False
 
 
 class NodeSpec(BaseModel):
-    """Hardware specification of a cluster node."""
+    """Hardware specification of a cluster node. Runtime state lives in NodeRuntime."""
+
+    model_config = ConfigDict(frozen=True, extra="forbid")
 
     name: str
     host: str
@@ -67,23 +75,204 @@ class NodeSpec(BaseModel):
     # Network
     tailscale_ip: Optional[str] = None
     lan_ip: Optional[str] = None
+    wol_mac: Optional[str] = None  # For Wake-on-LAN
+
+
+class NodeRuntime(BaseModel):
+    """Mutable runtime state of a node, updated by monitoring."""
 
-    # State
     online: bool = False
     power_state: str = "unknown"  # on, off, sleeping, unknown
-    wol_mac: Optional[str] = None  # For Wake-on-LAN
+    utilization_pct: Optional[float] = None  # Average across accelerators
+    memory_used_gb: Optional[float] = None
+    temperature_c: Optional[float] = None
+    healthy_services: frozenset[str] = frozenset()  # Names of services passing checks
 
 
 class ClusterSpec(BaseModel):
     """Full cluster topology."""
 
+    # Reassigning a field (e.g. `nodes`) re-runs validation, which rebuilds the indexes
+    model_config = ConfigDict(validate_assignment=True)
+
     name: str
     proxmox_host: str
     proxmox_user: str = "root@pam"
-    nodes: list[NodeSpec] = []
+    nodes: tuple[NodeSpec, ...] = ()  # Immutable: replace it or use add_node/remove_node
+    runtime: dict[str, NodeRuntime] = {}
+
+    # Inverted indexes over `nodes`, rebuilt whenever it is replaced
+    _by_name: dict[str, NodeSpec] = PrivateAttr(default_factory=dict)
+    # Capability -> node names; dict keys keep config order for deterministic results
+    _cap_index: dict[Capability, dict[str, None]] = PrivateAttr(default_factory=dict)
+    _online: set[str] = PrivateAttr(default_factory=set)
+    # model -> nodes with a service listing it, and the subset where it is healthy.
+    # Frozen, so nodes_with_model can hand them out without copying.
+    _model_index: dict[str, frozenset[str]] = PrivateAttr(default_factory=dict)
+    _healthy_model_index: dict[str, frozenset[str]] = PrivateAttr(default_factory=dict)
+    # Dense per-node columns read by the scheduler instead of walking the models
+    _utilization: dict[str, float] = PrivateAttr(default_factory=dict)
+    _max_vram: dict[str, float] = PrivateAttr(default_factory=dict)
+    # Called with a node name whenever that node's spec or runtime state changes
+    _listeners: list[Callable[[str], None]] = PrivateAttr(default_factory=list)
+
+    @model_validator(mode="after")
+    def _sync_indexes(self) -> ClusterSpec:
+        # Runs after construction and after every field assignment
+        previous = self._by_name
+        self._reindex()
+        for name in previous.keys() | self._by_name.keys():
+            if previous.get(name) is not self._by_name.get(name):
+                self._notify(name)
+        return self
+
+    def model_copy(self, *, update: Optional[Mapping[str, Any]] = None, deep: bool = False) -> Self:
+        """Copy with independent runtime state and indexes, and no listeners."""
+        listeners, self._listeners = self._listeners, []
+        try:
+            copy = super().model_copy(update=update, deep=deep)
+        finally:
+            self._listeners = listeners
+        copy._listeners = []
+        copy.runtime = {name: rt.model_copy() for name, rt in copy.runtime.items()}
+        return copy
+
+    def _reindex(self) -> None:
+        self._by_name = {n.name: n for n in self.nodes}
+        self._cap_index = {}
+        models: dict[str, set[str]] = {}
+        healthy_models: dict[str, set[str]] = {}
+        for n in self.nodes:
+            rt = self.runtime.setdefault(n.name, NodeRuntime())
+            for cap in n.capabilities:
+                self._cap_index.setdefault(cap, {})[n.name] = None
+            for svc in n.services:
+                for model in svc.models:
+                    models.setdefault(model, set()).add(n.name)
+                    if svc.name in rt.healthy_services:
+                        healthy_models.setdefault(model, set()).add(n.name)
+        self._model_index = {m: frozenset(names) for m, names in models.items()}
+        self._healthy_model_index = {m: frozenset(names) for m, names in healthy_models.items()}
+        self._max_vram = {
+            n.name: max((a.vram_gb or 0.0 for a in n.accelerators), default=0.0) for n in self.nodes
+        }
+        # Only current nodes count; runtime may still hold entries for removed ones
+        self._online = {n.name for n in self.nodes if self.runtime[n.name].online}
+        self._utilization = {
+            n.name: self.runtime[n.name].utilization_pct or 0.0 for n in self.nodes
+        }
+
+    @classmethod
+    def load(cls, path: str | Path) -> ClusterSpec:
+        """Load a cluster from a ``.json`` state snapshot or a YAML file."""
+        path = Path(path)
+        if path.suffix == ".json":
+            return cls.model_validate_json(path.read_bytes())
+        with path.open(encoding="utf-8") as f:
+            return cls.model_validate(yaml.load(f, Loader=_YAMLLoader))
+
+    def save(self, path: str | Path) -> None:
+        """Write the cluster (spec and runtime state) as JSON or YAML by suffix."""
+        path = Path(path)
+        if path.suffix == ".json":
+            path.write_text(self.model_dump_json(), encoding="utf-8")
+            return
+        with path.open("w", encoding="utf-8") as f:
+            yaml.dump(self.model_dump(mode="json"), f, Dumper=_YAMLDumper, sort_keys=False)
+
+    def add_listener(self, callback: Callable[[str], None]) -> None:
+        """Register a callback notified with a node's name whenever it changes."""
+        self._listeners.append(callback)
+
+    def _notify(self, name: str) -> None:
+        for callback in self._listeners:
+            callback(name)
 
     def get_node(self, name: str) -> Optional[NodeSpec]:
-        return next((n for n in self.nodes if n.name == name), None)
+        return self._by_name.get(name)
+
+    def add_node(self, node: NodeSpec) -> None:
+        """Add a node, or replace the one with the same name."""
+        self.nodes = (*(n for n in self.nodes if n.name != node.name), node)
+
+    def remove_node(self, name: str) -> None:
+        """Remove a node and its runtime state."""
+        self.runtime.pop(name, None)
+        self.nodes = tuple(n for n in self.nodes if n.name != name)
 
     def nodes_with_capability(self, cap: Capability) -> list[NodeSpec]:
-        return [n for n in self.nodes if cap in n.capabilities and n.online]
+        return [self._by_name[n] for n in self._cap_index.get(cap, ()) if n in self._online]
+
+    def nodes_with_model(self, model: str, healthy: bool = False) -> frozenset[str]:
+        """Names of nodes with a service serving `model` (only healthy ones if asked)."""
+        index = self._healthy_model_index if healthy else self._model_index
+        return index.get(model, frozenset())
+
+    def is_online(self, name: str) -> bool:
+        return name in self._online
+
+    def utilization(self, name: str) -> float:
+        """Average accelerator utilization of a node, 0 when unknown."""
+        return self._utilization.get(name, 0.0)
+
+    def max_vram_gb(self, name: str) -> float:
+        """VRAM of the node's largest accelerator, 0 when it has none."""
+        return self._max_vram.get(name, 0.0)
+
+    def set_online(self, name: str, online: bool) -> None:
+        """Mark a node online/offline, keeping the capability index consistent."""
+        self.runtime[name].online = online
+        if online:
+            self._online.add(name)
+        else:
+            self._online.discard(name)
+        self._notify(name)
+
+    def update_stats(
+        self,
+        name: str,
+        utilization_pct: Optional[float] = None,
+        memory_used_gb: Optional[float] = None,
+        temperature_c: Optional[float] = None,
+    ) -> None:
+        """Record fresh monitoring data for a node."""
+        rt = self.runtime[name]
+        rt.utilization_pct = utilization_pct
+        rt.memory_used_gb = memory_used_gb
+        rt.temperature_c = temperature_c
+        self._utilization[name] = utilization_pct or 0.0
+        self._notify(name)
+
+    def set_service_healthy(self, name: str, service: str, healthy: bool) -> None:
+        """Record a service health check, keeping the warm-model index consistent."""
+        node = self._by_name[name]
+        svc = next((s for s in node.services if s.name == service), None)
+        if svc is None:
+            raise KeyError(f"Node {name} has no service {service!r}")
+        rt = self.runtime[name]
+        if (service in rt.healthy_services) == healthy:
+            return
+        if healthy:
+            rt.healthy_services = rt.healthy_services | {service}
+        else:
+            rt.healthy_services = rt.healthy_services - {service}
+
+        for model in svc.models:
+            # Another healthy service on the node may still serve the model
+            serving = any(
+                s.name in rt.healthy_services and model in s.models for s in node.services
+            )
+            names = self._healthy_model_index.get(model, frozenset())
+            names = names | {name} if serving else names - {name}
+            if names:
+                self._healthy_model_index[model] = names
+            else:
+                self._healthy_model_index.pop(model, None)
+        self._notify(name)
+
+    def add_capability(self, name: str, cap: Capability) -> None:
+        """Advertise a new capability on a node."""
+        node = self._by_name[name]
+        if cap not in node.capabilities:
+            node = node.model_copy(update={"capabilities": [*node.capabilities, cap]})
+            self.nodes = tuple(node if n.name == name else n for n in self.nodes)
@@ -3,25 +3,181 @@
 from __future__ import annotations
 
 import asyncio
+import functools
+import heapq
+import itertools
 import logging
-from typing import Optional
+import math
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any, Optional
 
 from .hardware import Capability, ClusterSpec, NodeSpec
 from .task import Task, TaskStatus
 
 logger = logging.getLogger(__name__)
 
+WARM_MODEL_BONUS = 50.0  # Score bonus for nodes already serving the requested model
+
+HeapEntry = tuple[float, int, str]  # (avg GPU utilization, tiebreak, node name)
+NodeFilter = Callable[[str], bool]  # Called with a node name
+Executor = Callable[[Task], Awaitable[Any]]  # Runs a routed task, returns its result
+
+
+class TaskQueue:
+    """Priority queue of tasks backed by a bare heap, highest priority first.
+
+    Lighter than asyncio.PriorityQueue: put never blocks and a single Event wakes the
+    consumer instead of a future per waiter. Equal priorities stay FIFO.
+    """
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[int, int, Task]] = []
+        self._seq = itertools.count()
+        self._has_items = asyncio.Event()
+        self._unfinished = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def put(self, task: Task) -> None:
+        heapq.heappush(self._heap, (-task.priority, next(self._seq), task))
+        self._unfinished += 1
+        self._idle.clear()
+        self._has_items.set()
+
+    async def get(self) -> Task:
+        while not self._heap:
+            self._has_items.clear()
+            await self._has_items.wait()
+        return heapq.heappop(self._heap)[2]
+
+    def task_done(self) -> None:
+        if self._unfinished <= 0:
+            raise ValueError("task_done() called too many times")
+        self._unfinished -= 1
+        if self._unfinished == 0:
+            self._idle.set()
+
+    async def join(self) -> None:
+        """Wait until every task put so far has been marked done."""
+        await self._idle.wait()
+
 
 class Scheduler:
     """Routes tasks to the best available node based on capabilities, load, and constraints."""
 
-    def __init__(self, cluster: ClusterSpec):
+    def __init__(self, cluster: ClusterSpec, executor: Optional[Executor] = None):
         self.cluster = cluster
-        self.queue: asyncio.PriorityQueue[tuple[int, Task]] = asyncio.PriorityQueue()
+        self.executor = executor
+        # Submissions waiting for the router, highest priority first
+        self.queue = TaskQueue()
+        # Routed tasks waiting for their node's worker (only used with an executor)
+        self.node_queues: dict[str, asyncio.Queue[Task]] = {}
+        self._workers: dict[str, asyncio.Task[None]] = {}
         self._running_tasks: dict[str, Task] = {}
+        self._router: Optional[asyncio.Task[None]] = None
+
+        # Per-capability min-heaps keyed by utilization. Entries are never removed in
+        # place: re-scoring a node pushes a fresh entry and the old one goes stale.
+        self._heaps: dict[Capability, list[HeapEntry]] = {}
+        self._node_index: dict[str, HeapEntry] = {}
+        self._tiebreak = itertools.count()
+        self._filters: dict[tuple[frozenset[str], Optional[float]], NodeFilter] = {}
+        for node in cluster.nodes:
+            self.update_node(node.name)
+        cluster.add_listener(self.update_node)
+
+    def update_node(self, name: str) -> None:
+        """Re-score a node after its stats, capabilities or membership changed."""
+        node = self.cluster.get_node(name)
+        if node is None or not self.cluster.is_online(name):
+            # Unknown or offline: its heap entries go stale until set_online re-scores it
+            self._node_index.pop(name, None)
+            return
+
+        entry = (self.cluster.utilization(name), next(self._tiebreak), name)
+        self._node_index[name] = entry
+        for cap in node.capabilities:
+            heap = self._heaps.setdefault(cap, [])
+            heapq.heappush(heap, entry)
+            if len(heap) > 4 * len(self._node_index) + 16:
+                self._compact(heap)
+
+    def _compile_filter(self, excluded: frozenset[str], min_vram_gb: Optional[float]) -> NodeFilter:
+        """Compose one predicate holding only the constraint checks that apply.
+
+        Checks read the cluster's per-node columns rather than the node models, and
+        are cached by constraint shape so tasks with the same constraints share one.
+        Capability is not rechecked: the heap being scanned already implies it.
+        """
+        key = (excluded, min_vram_gb)
+        accepts = self._filters.get(key)
+        if accepts is not None:
+            return accepts
+
+        preds: list[NodeFilter] = [self.cluster.is_online]
+        if excluded:
+            preds.append(lambda name: name not in excluded)
+        if min_vram_gb:
+            max_vram_gb = self.cluster.max_vram_gb
+            preds.append(lambda name: max_vram_gb(name) >= min_vram_gb)
+        accepts = functools.reduce(lambda f, g: lambda name: f(name) and g(name), preds)
+
+        if len(self._filters) >= 256:
+            self._filters.clear()
+        self._filters[key] = accepts
+        return accepts
+
+    def _is_live(self, entry: HeapEntry) -> bool:
+        # Compare tiebreaks rather than identity: compiled builds unbox tuples
+        current = self._node_index.get(entry[2])
+        return current is not None and current[1] == entry[1]
+
+    def _compact(self, heap: list[HeapEntry]) -> None:
+        heap[:] = [e for e in heap if self._is_live(e)]
+        heapq.heapify(heap)
+
+    def start(self) -> None:
+        """Start the router loop on the running event loop (idempotent)."""
+        if self._router is None or self._router.done():
+            self._router = asyncio.get_running_loop().create_task(self._router_loop())
+
+    async def stop(self) -> None:
+        """Stop the router and node workers. Tasks not yet started stay queued."""
+        loops = [t for t in (self._router, *self._workers.values()) if t is not None]
+        for t in loops:
+            t.cancel()
+        await asyncio.gather(*loops, return_exceptions=True)
+        self._router = None
+        self._workers.clear()
 
     async def submit(self, task: Task) -> Task:
-        """Submit a task for scheduling."""
+        """Submit a task for scheduling.
+
+        Returns immediately with the task pending; the router loop assigns it to a
+        node. Await ``queue.join()`` to wait until everything submitted is routed.
+        """
+        task.status = TaskStatus.PENDING
+        self.queue.put(task)
+        self.start()
+        return task
+
+    async def _router_loop(self) -> None:
+        while True:
+            task = await self.queue.get()
+            try:
+                self._route(task)
+            except Exception as e:
+                task.status = TaskStatus.FAILED
+                task.error = f"Routing error: {e}"
+                logger.exception(f"Task {task.id} failed while routing")
+            finally:
+                self.queue.task_done()
+
+    def _route(self, task: Task) -> None:
         task.status = TaskStatus.ROUTING
 
         node = self._find_best_node(task)
@@ -29,70 +185,109 @@ class Scheduler:
             task.status = TaskStatus.FAILED
             task.error = f"No available node with capability: {task.type}"
             logger.warning(f"Task {task.id} failed: {task.error}")
-            return task
+            return
 
         task.assigned_node = node.name
         task.status = TaskStatus.QUEUED
         logger.info(f"Task {task.id} ({task.type}) → {node.name}")
 
-        # TODO: actually execute the task via executor
-        return task
+        if self.executor is None:
+            return  # Nothing runs tasks; leave them QUEUED rather than hold them forever
+        self.node_queues.setdefault(node.name, asyncio.Queue()).put_nowait(task)
+        worker = self._workers.get(node.name)
+        if worker is None or worker.done():
+            self._workers[node.name] = asyncio.get_running_loop().create_task(
+                self._node_loop(self.node_queues[node.name])
+            )
+
+    async def _node_loop(self, queue: asyncio.Queue[Task]) -> None:
+        while True:
+            task = await queue.get()
+            try:
+                await self._execute(task)
+            finally:
+                queue.task_done()
+
+    async def _execute(self, task: Task) -> None:
+        assert self.executor is not None
+        task.status = TaskStatus.RUNNING
+        task.started_at_ns = time.monotonic_ns()
+        self._running_tasks[task.id] = task
+        try:
+            task.result = await self.executor(task)
+            task.status = TaskStatus.COMPLETED
+        except asyncio.CancelledError:
+            task.status = TaskStatus.CANCELLED
+            raise
+        except Exception as e:
+            task.status = TaskStatus.FAILED
+            task.error = str(e)
+            logger.warning(f"Task {task.id} failed on {task.assigned_node}: {e}")
+        finally:
+            task.completed_at_ns = time.monotonic_ns()
+            del self._running_tasks[task.id]
 
     def _find_best_node(self, task: Task) -> Optional[NodeSpec]:
         """Find the optimal node for a task."""
-        candidates = self.cluster.nodes_with_capability(task.type)
-
         # Apply constraints
         if task.constraints.preferred_node:
             preferred = self.cluster.get_node(task.constraints.preferred_node)
-            if preferred and preferred.online and task.type in preferred.capabilities:
+            if (
+                preferred
+                and self.cluster.is_online(preferred.name)
+                and task.type in preferred.capabilities
+            ):
                 return preferred
 
-        if task.constraints.excluded_nodes:
-            candidates = [n for n in candidates if n.name not in task.constraints.excluded_nodes]
-
-        if task.constraints.min_vram_gb:
-            candidates = [
-                n
-                for n in candidates
-                if any(
-                    a.vram_gb and a.vram_gb >= task.constraints.min_vram_gb
-                    for a in n.accelerators
-                )
-            ]
-
-        if not candidates:
+        heap = self._heaps.get(task.type)
+        if not heap:
             return None
 
         # Warm model routing: prefer nodes that already have the model loaded
-        if task.model and task.constraints.require_warm_model:
-            warm = [
-                n
-                for n in candidates
-                if any(task.model in s.models for s in n.services)
-            ]
-            if warm:
-                candidates = warm
-
-        # Score candidates (lower utilization = better)
-        def score(node: NodeSpec) -> float:
-            # Prefer nodes with lower GPU utilization
-            gpu_util = 0.0
-            gpu_count = 0
-            for acc in node.accelerators:
-                if acc.utilization_pct is not None:
-                    gpu_util += acc.utilization_pct
-                    gpu_count += 1
-            avg_util = gpu_util / max(gpu_count, 1)
-
-            # Bonus for warm models
-            warm_bonus = 0
-            if task.model:
-                for svc in node.services:
-                    if task.model in svc.models and svc.healthy:
-                        warm_bonus = -50  # Big bonus for warm models
-
-            return avg_util + warm_bonus
-
-        candidates.sort(key=score)
-        return candidates[0]
+        warm_nodes: frozenset[str] = frozenset()
+        hot_nodes: frozenset[str] = frozenset()
+        if task.model:
+            warm_nodes = self.cluster.nodes_with_model(task.model)
+            hot_nodes = self.cluster.nodes_with_model(task.model, healthy=True)
+        require_warm = bool(warm_nodes and task.constraints.require_warm_model)
+        accepts = self._compile_filter(
+            task.constraints.excluded_nodes, task.constraints.min_vram_gb
+        )
+
+        # Pop in ascending utilization. A healthy warm node gets a bonus, so once the
+        # utilization passes best score + bonus no later node can win.
+        popped: list[HeapEntry] = []
+        best: Optional[NodeSpec] = None
+        best_score = math.inf
+        best_warm: Optional[NodeSpec] = None
+        best_warm_score = math.inf
+        while heap:
+            entry = heapq.heappop(heap)
+            util, _, name = entry
+            if not self._is_live(entry):
+                continue  # stale entry, dropped for good
+            popped.append(entry)
+
+            if require_warm and best_warm is not None:
+                if util - WARM_MODEL_BONUS >= best_warm_score:
+                    break
+            elif not require_warm and best is not None:
+                if not hot_nodes or util - WARM_MODEL_BONUS >= best_score:
+                    break
+
+            if not accepts(name):
+                continue
+            node = self.cluster.get_node(name)
+            if node is None:
+                continue
+
+            score = util - WARM_MODEL_BONUS if name in hot_nodes else util
+            if require_warm and name in warm_nodes and score < best_warm_score:
+                best_warm, best_warm_score = node, score
+            if score < best_score:
+                best, best_score = node, score
+
+        for entry in popped:
+            heapq.heappush(heap, entry)
+
+        return best_warm or best
@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
-import uuid
-from datetime import datetime
+import functools
+import os
+import sys
+from datetime import UTC, datetime
 from enum import Enum
 from typing import Any, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, computed_field, field_validator
 
 from .hardware import Capability
 
@@ -30,19 +32,53 @@ class TaskPriority(int, Enum):
 
 
 class TaskConstraints(BaseModel):
-    """Constraints on where/how the task can run."""
+    """Constraints on where/how the task can run.
+
+    Frozen and hashable, so identical constraints can share one instance (see
+    ``make_constraints``). Node names are interned.
+    """
+
+    model_config = ConfigDict(frozen=True)
 
     max_latency_ms: Optional[int] = None
     preferred_node: Optional[str] = None
-    excluded_nodes: list[str] = []
+    excluded_nodes: frozenset[str] = frozenset()
     min_vram_gb: Optional[float] = None
     require_warm_model: bool = False  # Only route to nodes with model already loaded
 
+    @field_validator("preferred_node")
+    @classmethod
+    def _intern_preferred(cls, v: Optional[str]) -> Optional[str]:
+        return sys.intern(v) if v is not None else None
+
+    @field_validator("excluded_nodes")
+    @classmethod
+    def _intern_excluded(cls, v: frozenset[str]) -> frozenset[str]:
+        return frozenset(sys.intern(n) for n in v)
+
+
+@functools.lru_cache(maxsize=1024)
+def make_constraints(
+    max_latency_ms: Optional[int] = None,
+    preferred_node: Optional[str] = None,
+    excluded_nodes: frozenset[str] = frozenset(),
+    min_vram_gb: Optional[float] = None,
+    require_warm_model: bool = False,
+) -> TaskConstraints:
+    """Return a shared TaskConstraints instance for this combination of values."""
+    return TaskConstraints(
+        max_latency_ms=max_latency_ms,
+        preferred_node=preferred_node,
+        excluded_nodes=excluded_nodes,
+        min_vram_gb=min_vram_gb,
+        require_warm_model=require_warm_model,
+    )
+
 
 class Task(BaseModel):
     """A unit of work submitted to the orchestrator."""
 
-    id: str = Field(default_factory=lambda: uuid.uuid4().hex[:12])
+    id: str = Field(default_factory=lambda: os.urandom(6).hex())
     type: Capability
     model: Optional[str] = None
     input: Any = None
@@ -54,16 +90,20 @@ class Task(BaseModel):
     # Lifecycle
     status: TaskStatus = TaskStatus.PENDING
     assigned_node: Optional[str] = None
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    started_at: Optional[datetime] = None
-    completed_at: Optional[datetime] = None
+    # Wall-clock creation time, for people and API clients
+    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    # time.monotonic_ns() readings for duration math; meaningless outside this process,
+    # so they are left out of dumps (clients get duration_ms instead)
+    started_at_ns: Optional[int] = Field(default=None, exclude=True)
+    completed_at_ns: Optional[int] = Field(default=None, exclude=True)
 
     # Result
     result: Any = None
     error: Optional[str] = None
 
+    @computed_field  # type: ignore[prop-decorator]
     @property
     def duration_ms(self) -> Optional[float]:
-        if self.started_at and self.completed_at:
-            return (self.completed_at - self.started_at).total_seconds() * 1000
+        if self.started_at_ns is not None and self.completed_at_ns is not None:
+            return (self.completed_at_ns - self.started_at_ns) / 1e6
         return None
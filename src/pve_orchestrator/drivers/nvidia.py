@@ -2,16 +2,42 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import subprocess
+import sys
+import threading
+from collections.abc import Callable
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, Optional
 
 logger = logging.getLogger(__name__)
 
+NVIDIA_SMI_ARGS = [
+    "nvidia-smi",
+    "--query-gpu=index,name,utilization.gpu,memory.used,memory.total,temperature.gpu,power.draw",
+    "--format=csv,noheader,nounits",
+]
 
-@dataclass
+# Reuse one multiplexed OpenSSH connection per host across polls (no mux on Windows).
+# The socket lives in the user-private ~/.ssh; %C hashes user, host and port so the
+# path stays under the Unix socket length limit.
+SSH_CONTROL_ARGS = (
+    []
+    if sys.platform == "win32"
+    else [
+        "-o",
+        "ControlMaster=auto",
+        "-o",
+        "ControlPath=~/.ssh/pveo-%C",
+        "-o",
+        "ControlPersist=600",
+    ]
+)
+
+
+@dataclass(slots=True, frozen=True)
 class GPUStatus:
     index: int
     name: str
@@ -31,76 +57,320 @@ class GPUStatus:
         return (self.memory_used_mb / self.memory_total_mb) * 100 if self.memory_total_mb else 0
 
 
+def _optional_float(value: str) -> float:
+    # nvidia-smi prints "[N/A]" or "[Not Supported]" for values a GPU doesn't report;
+    # read those as 0.0, as _nvml_field does, rather than dropping the GPU
+    return 0.0 if value.strip().startswith("[") else float(value)
+
+
+def _parse_gpu_csv(stdout: str) -> list[GPUStatus]:
+    # float()/int() tolerate the padding nvidia-smi puts around values, so only the
+    # name column needs stripping.
+    rows = (line.split(",") for line in stdout.splitlines())
+    return [
+        GPUStatus(
+            index=int(r[0]),
+            name=r[1].strip(),
+            utilization_pct=_optional_float(r[2]),
+            memory_used_mb=float(r[3]),
+            memory_total_mb=float(r[4]),
+            temperature_c=_optional_float(r[5]),
+            power_draw_w=_optional_float(r[6]),
+            processes=[],
+        )
+        for r in rows
+        if len(r) >= 7
+    ]
+
+
 def query_gpus_ssh(host: str, user: str = "Admin") -> list[GPUStatus]:
     """Query GPU status on a remote host via SSH + nvidia-smi."""
-    cmd = [
-        "ssh",
-        f"{user}@{host}",
-        "nvidia-smi",
-        "--query-gpu=index,name,utilization.gpu,memory.used,memory.total,temperature.gpu,power.draw",
-        "--format=csv,noheader,nounits",
-    ]
+    cmd = ["ssh", *SSH_CONTROL_ARGS, f"{user}@{host}", *NVIDIA_SMI_ARGS]
     try:
         result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
         if result.returncode != 0:
             logger.error(f"nvidia-smi failed on {host}: {result.stderr}")
             return []
+        return _parse_gpu_csv(result.stdout)
+    except Exception as e:
+        logger.error(f"Failed to query GPUs on {host}: {e}")
+        return []
+
+
+class SSHConnectionPool:
+    """Persistent asyncssh connections, one per host.
+
+    Each query opens a new channel on the host's existing connection, so repeated
+    polls skip the TCP and key-exchange handshake.
+    """
+
+    def __init__(self, user: str = "Admin"):
+        self.user = user
+        self._conns: dict[str, Any] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
 
-        gpus = []
-        for line in result.stdout.strip().split("\n"):
-            parts = [p.strip() for p in line.split(",")]
-            if len(parts) >= 7:
-                gpus.append(
-                    GPUStatus(
-                        index=int(parts[0]),
-                        name=parts[1],
-                        utilization_pct=float(parts[2]),
-                        memory_used_mb=float(parts[3]),
-                        memory_total_mb=float(parts[4]),
-                        temperature_c=float(parts[5]),
-                        power_draw_w=float(parts[6]),
-                        processes=[],
-                    )
-                )
-        return gpus
+    async def get(self, host: str) -> Any:
+        import asyncssh
+
+        async with self._locks.setdefault(host, asyncio.Lock()):
+            conn = self._conns.get(host)
+            if conn is None:
+                conn = await asyncssh.connect(host, username=self.user, connect_timeout=10)
+                self._conns[host] = conn
+            return conn
+
+    def discard(self, host: str, conn: Any) -> None:
+        """Drop a broken connection so the next query to `host` reconnects."""
+        current = self._conns.get(host)
+        if current is None or current is not conn:
+            return  # Already replaced; leave the newer connection alone
+        del self._conns[host]
+        current.close()
+
+    async def close(self) -> None:
+        conns, self._conns = list(self._conns.values()), {}
+        for conn in conns:
+            conn.close()
+        await asyncio.gather(*(c.wait_closed() for c in conns), return_exceptions=True)
+
+
+async def query_gpus_ssh_async(host: str, pool: SSHConnectionPool) -> list[GPUStatus]:
+    """Query GPU status on a remote host over a pooled asyncssh connection."""
+    import asyncssh
+
+    conn = None
+
+    async def run() -> Any:
+        nonlocal conn
+        conn = await pool.get(host)
+        return await conn.run(" ".join(NVIDIA_SMI_ARGS))
+
+    try:
+        # One deadline covers connecting and running, as with the ssh subprocess
+        result = await asyncio.wait_for(run(), timeout=10)
+        if result.exit_status != 0:
+            logger.error(f"nvidia-smi failed on {host}: {result.stderr}")
+            return []
+        return _parse_gpu_csv(result.stdout)
+    except TimeoutError:
+        # A slow host is not a broken connection; keep it for other queries
+        logger.error(f"Timed out querying GPUs on {host}")
+        return []
+    except (asyncssh.Error, OSError) as e:
+        # The connection itself is broken; other queries on it are failing too
+        logger.error(f"Failed to query GPUs on {host}: {e}")
+        if conn is not None:
+            pool.discard(host, conn)
+        return []
     except Exception as e:
         logger.error(f"Failed to query GPUs on {host}: {e}")
         return []
 
 
-def query_gpus_local() -> list[GPUStatus]:
-    """Query GPU status on local machine."""
+async def query_all(
+    hosts: list[str], pool: Optional[SSHConnectionPool] = None, user: str = "Admin"
+) -> dict[str, list[GPUStatus]]:
+    """Query GPU status on many hosts concurrently.
+
+    Falls back to one ``ssh`` process per host in worker threads when asyncssh
+    is not installed.
+    """
+    try:
+        import asyncssh  # noqa: F401
+    except ImportError:
+        logger.debug("asyncssh not installed, falling back to ssh subprocesses")
+        results = await asyncio.gather(*(asyncio.to_thread(query_gpus_ssh, h, user) for h in hosts))
+        return dict(zip(hosts, results, strict=True))
+
+    own_pool = pool is None
+    pool = pool or SSHConnectionPool(user)
+    try:
+        results = await asyncio.gather(*(query_gpus_ssh_async(h, pool) for h in hosts))
+    finally:
+        if own_pool:
+            await pool.close()
+    return dict(zip(hosts, results, strict=True))
+
+
+class NvidiaPoller:
+    """Streams GPU status from one long-lived ``nvidia-smi -lms`` process.
+
+    nvidia-smi is forked (and NVML initialized) once; every interval it prints a
+    line per GPU, which is parsed into ``latest`` and handed to ``on_update``.
+    Pass ``host`` to run the same command over SSH.
+    """
+
+    def __init__(
+        self,
+        host: Optional[str] = None,
+        user: str = "Admin",
+        interval_ms: int = 1000,
+        on_update: Optional[Callable[[list[GPUStatus]], None]] = None,
+    ):
+        self.host = host
+        self.user = user
+        self.interval_ms = interval_ms
+        self.on_update = on_update
+        self.latest: list[GPUStatus] = []
+        self._proc: Optional[asyncio.subprocess.Process] = None
+        self._reader: Optional[asyncio.Task[None]] = None
+        self._gpu_count: Optional[int] = None
+
+    @property
+    def running(self) -> bool:
+        return self._reader is not None and not self._reader.done()
+
+    def _command(self) -> list[str]:
+        cmd = [*NVIDIA_SMI_ARGS, "-lms", str(self.interval_ms)]
+        if self.host is None:
+            return cmd
+        return ["ssh", *SSH_CONTROL_ARGS, f"{self.user}@{self.host}", *cmd]
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        try:
+            self._proc = await asyncio.create_subprocess_exec(
+                *self._command(),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+        except FileNotFoundError as e:
+            logger.error(f"Cannot start GPU poller: {e}")
+            return
+        self._reader = asyncio.get_running_loop().create_task(self._read_loop())
+
+    async def stop(self) -> None:
+        if self._proc is not None and self._proc.returncode is None:
+            self._proc.terminate()
+            await self._proc.wait()
+        if self._reader is not None:
+            self._reader.cancel()
+            try:
+                await self._reader
+            except asyncio.CancelledError:
+                pass
+        self._proc = self._reader = None
+
+    async def _read_loop(self) -> None:
+        assert self._proc is not None and self._proc.stdout is not None
+        batch: list[GPUStatus] = []
+        async for raw in self._proc.stdout:
+            try:
+                gpus = _parse_gpu_csv(raw.decode())
+            except ValueError as e:
+                logger.debug(f"Skipping unparsable nvidia-smi line: {e}")
+                continue
+            if not gpus:
+                continue
+
+            # A sample ends when the index wraps around. The largest sample seen so far
+            # gives the GPU count, so a complete one is published without waiting for
+            # the next; a sample short a skipped line must not shrink that count.
+            if batch and gpus[0].index <= batch[-1].index:
+                self._gpu_count = max(self._gpu_count or 0, len(batch))
+                self._publish(batch)
+                batch = []
+            batch.extend(gpus)
+            if len(batch) == self._gpu_count:
+                self._publish(batch)
+                batch = []
+
+        logger.warning(f"nvidia-smi stream on {self.host or 'localhost'} ended")
+
+    def _publish(self, gpus: list[GPUStatus]) -> None:
+        self.latest = gpus
+        if self.on_update is not None:
+            try:
+                self.on_update(gpus)
+            except Exception:
+                logger.exception("GPU poller on_update callback failed")
+
+
+_nvml_lock = threading.Lock()
+_nvml_devices: Optional[list[tuple[Any, str]]] = None  # (handle, name) per GPU index
+
+
+def _nvml_init_once() -> list[tuple[Any, str]]:
+    """Initialize NVML and cache device handles; empty if NVML is unavailable."""
+    global _nvml_devices
+    with _nvml_lock:
+        if _nvml_devices is None:
+            try:
+                import pynvml
+
+                pynvml.nvmlInit()
+                devices = []
+                for i in range(pynvml.nvmlDeviceGetCount()):
+                    handle = pynvml.nvmlDeviceGetHandleByIndex(i)
+                    name = pynvml.nvmlDeviceGetName(handle)
+                    devices.append((handle, name.decode() if isinstance(name, bytes) else name))
+                _nvml_devices = devices
+            except ImportError:
+                logger.debug("nvidia-ml-py not installed, using nvidia-smi")
+                _nvml_devices = []
+            except Exception as e:
+                logger.debug(f"NVML unavailable, using nvidia-smi: {e}")
+                _nvml_devices = []
+        return _nvml_devices
+
+
+def _nvml_field(not_supported: type[Exception], getter: Callable[..., Any], *args: Any) -> Any:
+    """Call an NVML getter, or return None if this GPU doesn't report that value.
+
+    Many boards (GeForce, some passthrough setups) raise NotSupported for power or
+    temperature; that shouldn't cost us the rest of the device's readings.
+    """
     try:
-        result = subprocess.run(
-            [
-                "nvidia-smi",
-                "--query-gpu=index,name,utilization.gpu,memory.used,memory.total,temperature.gpu,power.draw",
-                "--format=csv,noheader,nounits",
-            ],
-            capture_output=True,
-            text=True,
-            timeout=10,
+        return getter(*args)
+    except not_supported:
+        return None
+
+
+def _query_gpus_nvml(devices: list[tuple[Any, str]]) -> list[GPUStatus]:
+    import pynvml
+
+    not_supported = pynvml.NVMLError_NotSupported
+    gpus = []
+    for index, (handle, name) in enumerate(devices):
+        mem = pynvml.nvmlDeviceGetMemoryInfo(handle)
+        util = _nvml_field(not_supported, pynvml.nvmlDeviceGetUtilizationRates, handle)
+        temp = _nvml_field(
+            not_supported, pynvml.nvmlDeviceGetTemperature, handle, pynvml.NVML_TEMPERATURE_GPU
         )
+        power_mw = _nvml_field(not_supported, pynvml.nvmlDeviceGetPowerUsage, handle)
+        gpus.append(
+            GPUStatus(
+                index=index,
+                name=name,
+                utilization_pct=float(util.gpu) if util is not None else 0.0,
+                memory_used_mb=mem.used / 2**20,
+                memory_total_mb=mem.total / 2**20,
+                temperature_c=float(temp or 0),
+                power_draw_w=(power_mw or 0) / 1000,
+                processes=[],
+            )
+        )
+    return gpus
+
+
+def query_gpus_local() -> list[GPUStatus]:
+    """Query GPU status on local machine.
+
+    Uses in-process NVML bindings when available, otherwise forks nvidia-smi.
+    """
+    devices = _nvml_init_once()
+    if devices:
+        try:
+            return _query_gpus_nvml(devices)
+        except Exception as e:
+            logger.warning(f"NVML query failed, falling back to nvidia-smi: {e}")
+
+    try:
+        result = subprocess.run(NVIDIA_SMI_ARGS, capture_output=True, text=True, timeout=10)
         if result.returncode != 0:
             return []
-
-        gpus = []
-        for line in result.stdout.strip().split("\n"):
-            parts = [p.strip() for p in line.split(",")]
-            if len(parts) >= 7:
-                gpus.append(
-                    GPUStatus(
-                        index=int(parts[0]),
-                        name=parts[1],
-                        utilization_pct=float(parts[2]),
-                        memory_used_mb=float(parts[3]),
-                        memory_total_mb=float(parts[4]),
-                        temperature_c=float(parts[5]),
-                        power_draw_w=float(parts[6]),
-                        processes=[],
-                    )
-                )
-        return gpus
+        return _parse_gpu_csv(result.stdout)
     except FileNotFoundError:
         logger.debug("nvidia-smi not found locally")
         return []
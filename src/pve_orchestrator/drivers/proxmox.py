@@ -2,13 +2,20 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import logging
-from typing import Any, Optional
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional, TypeVar
 
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 class PVENodeStatus(BaseModel):
     node: str
@@ -20,15 +27,29 @@ class PVENodeStatus(BaseModel):
     uptime: Optional[int] = None
 
 
+# Validates a whole API response in one pydantic-core call
+_PVE_NODE_LIST_ADAPTER = TypeAdapter(list[PVENodeStatus])
+
+
 class PVEDriver:
     """Interface to Proxmox VE API via proxmoxer."""
 
-    def __init__(self, host: str, user: str, token_name: str, token_value: str):
+    def __init__(
+        self,
+        host: str,
+        user: str,
+        token_name: str,
+        token_value: str,
+        resource_ttl: float = 2.0,
+    ):
         self.host = host
         self.user = user
         self.token_name = token_name
         self.token_value = token_value
+        self.resource_ttl = resource_ttl  # Seconds to reuse a cluster/resources response
         self._api = None
+        self._resource_cache: dict[Optional[str], tuple[float, list[dict]]] = {}
+        self._resource_gen = 0  # Bumped on invalidation so in-flight fetches aren't cached
 
     def connect(self):
         """Establish connection to Proxmox API."""
@@ -58,40 +79,158 @@ class PVEDriver:
 
     def get_nodes(self) -> list[PVENodeStatus]:
         """Get status of all Proxmox nodes."""
-        raw = self.api.nodes.get()
-        return [PVENodeStatus(**n) for n in raw]
+        return _PVE_NODE_LIST_ADAPTER.validate_python(self.api.nodes.get())
 
     def get_vms(self, node: str) -> list[dict[str, Any]]:
         """Get all VMs on a node."""
-        return self.api.nodes(node).qemu.get()
+        return _guests_on(self.get_cluster_resources(type="vm"), "qemu", node)
 
     def get_containers(self, node: str) -> list[dict[str, Any]]:
         """Get all LXC containers on a node."""
-        return self.api.nodes(node).lxc.get()
+        return _guests_on(self.get_cluster_resources(type="vm"), "lxc", node)
 
     def start_vm(self, node: str, vmid: int) -> str:
         """Start a VM."""
-        return self.api.nodes(node).qemu(vmid).status.start.post()
+        return self._guest_action(self.api.nodes(node).qemu(vmid).status.start.post)
 
     def stop_vm(self, node: str, vmid: int) -> str:
         """Stop a VM."""
-        return self.api.nodes(node).qemu(vmid).status.stop.post()
+        return self._guest_action(self.api.nodes(node).qemu(vmid).status.stop.post)
 
     def start_container(self, node: str, vmid: int) -> str:
         """Start an LXC container."""
-        return self.api.nodes(node).lxc(vmid).status.start.post()
+        return self._guest_action(self.api.nodes(node).lxc(vmid).status.start.post)
 
     def stop_container(self, node: str, vmid: int) -> str:
         """Stop an LXC container."""
-        return self.api.nodes(node).lxc(vmid).status.stop.post()
+        return self._guest_action(self.api.nodes(node).lxc(vmid).status.stop.post)
+
+    def _guest_action(self, post: Callable[[], str]) -> str:
+        # Invalidate on both sides: a fetch racing the POST must not be cached
+        self.invalidate_resources()
+        try:
+            return post()
+        finally:
+            self.invalidate_resources()
+
+    def invalidate_resources(self) -> None:
+        """Drop cached cluster/resources responses, including ones still in flight."""
+        self._resource_gen += 1
+        self._resource_cache.clear()
 
     def get_node_rrddata(self, node: str, timeframe: str = "hour") -> list[dict]:
         """Get RRD monitoring data for a node."""
         return self.api.nodes(node).rrddata.get(timeframe=timeframe)
 
     def get_cluster_resources(self, type: Optional[str] = None) -> list[dict]:
-        """Get all cluster resources (VMs, CTs, storage, nodes)."""
+        """Get all cluster resources (VMs, CTs, storage, nodes).
+
+        Responses are reused for ``resource_ttl`` seconds, so per-node lookups made
+        in one discovery pass cost a single API round-trip.
+        """
+        now = time.monotonic()
+        cached = self._resource_cache.get(type)
+        if cached and now - cached[0] < self.resource_ttl:
+            return cached[1]
+
+        gen = self._resource_gen
+        resources = self._fetch_cluster_resources(type)
+        if gen == self._resource_gen:
+            self._resource_cache[type] = (now, resources)
+        return resources
+
+    def _fetch_cluster_resources(self, type: Optional[str] = None) -> list[dict]:
         params = {}
         if type:
             params["type"] = type
         return self.api.cluster.resources.get(**params)
+
+
+def _guests_on(resources: list[dict], kind: str, node: str) -> list[dict[str, Any]]:
+    return [r for r in resources if r.get("type") == kind and r.get("node") == node]
+
+
+class AsyncPVEDriver:
+    """Asyncio wrapper around PVEDriver.
+
+    proxmoxer is blocking, so every call runs on a worker thread and the event loop
+    stays responsive. Fan-out helpers overlap the round-trips to several nodes.
+    cluster/resources responses are cached for the driver's ``resource_ttl`` and
+    concurrent callers on a miss share a single upstream request.
+    """
+
+    def __init__(self, driver: PVEDriver, max_workers: int = 16):
+        self._sync = driver
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pve")
+        self._cache: dict[tuple[Any, ...], tuple[float, Any]] = {}
+        self._cache_gen = 0
+        self._locks: dict[tuple[Any, ...], asyncio.Lock] = {}
+
+    async def _run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+
+    async def _cached(self, key: tuple[Any, ...], fn: Callable[..., T], *args: Any) -> T:
+        hit = self._cache.get(key)
+        if hit and time.monotonic() - hit[0] < self._sync.resource_ttl:
+            return hit[1]
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            # Another caller may have refreshed the entry while we waited
+            hit = self._cache.get(key)
+            if hit and time.monotonic() - hit[0] < self._sync.resource_ttl:
+                return hit[1]
+            gen = self._cache_gen
+            value = await self._run(fn, *args)
+            if gen == self._cache_gen:
+                self._cache[key] = (time.monotonic(), value)
+            return value
+
+    def _invalidate(self) -> None:
+        self._cache_gen += 1
+        self._cache.clear()
+
+    async def _guest_action(self, fn: Callable[[str, int], str], node: str, vmid: int) -> str:
+        self._invalidate()
+        try:
+            return await self._run(fn, node, vmid)
+        finally:
+            self._invalidate()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+    async def get_nodes(self) -> list[PVENodeStatus]:
+        return await self._run(self._sync.get_nodes)
+
+    async def get_vms(self, node: str) -> list[dict[str, Any]]:
+        return _guests_on(await self.get_cluster_resources(type="vm"), "qemu", node)
+
+    async def get_containers(self, node: str) -> list[dict[str, Any]]:
+        return _guests_on(await self.get_cluster_resources(type="vm"), "lxc", node)
+
+    async def start_vm(self, node: str, vmid: int) -> str:
+        return await self._guest_action(self._sync.start_vm, node, vmid)
+
+    async def stop_vm(self, node: str, vmid: int) -> str:
+        return await self._guest_action(self._sync.stop_vm, node, vmid)
+
+    async def start_container(self, node: str, vmid: int) -> str:
+        return await self._guest_action(self._sync.start_container, node, vmid)
+
+    async def stop_container(self, node: str, vmid: int) -> str:
+        return await self._guest_action(self._sync.stop_container, node, vmid)
+
+    async def get_node_rrddata(self, node: str, timeframe: str = "hour") -> list[dict]:
+        return await self._run(self._sync.get_node_rrddata, node, timeframe)
+
+    async def get_cluster_resources(self, type: Optional[str] = None) -> list[dict]:
+        return await self._cached(
+            ("cluster/resources", type), self._sync._fetch_cluster_resources, type
+        )
+
+    async def get_rrddata_many(
+        self, nodes: list[str], timeframe: str = "hour"
+    ) -> dict[str, list[dict]]:
+        """Get RRD monitoring data for several nodes concurrently."""
+        results = await asyncio.gather(*(self.get_node_rrddata(n, timeframe) for n in nodes))
+        return dict(zip(nodes, results, strict=True))
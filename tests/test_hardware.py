@@ -0,0 +1,87 @@
+import pytest
+
+from pve_orchestrator.core.hardware import (
+    Accelerator,
+    AcceleratorType,
+    Capability,
+    ClusterSpec,
+    NodeSpec,
+    ServiceEndpoint,
+)
+
+
+def make_cluster() -> ClusterSpec:
+    gpu = Accelerator(type=AcceleratorType.NVIDIA, model="RTX 4090", vram_gb=24.0)
+    vllm = ServiceEndpoint(name="vllm", port=8000, models=["llama"])
+    cluster = ClusterSpec(
+        name="lab",
+        proxmox_host="pve.example",
+        nodes=(
+            NodeSpec(
+                name="gpu1",
+                host="gpu1.example",
+                accelerators=[gpu],
+                capabilities=[Capability.LLM_INFERENCE],
+                services=[vllm],
+            ),
+            NodeSpec(name="nas", host="nas.example", capabilities=[Capability.STORAGE]),
+        ),
+    )
+    cluster.set_online("gpu1", True)
+    cluster.update_stats("gpu1", utilization_pct=42.0, memory_used_gb=10.0)
+    cluster.set_service_healthy("gpu1", "vllm", True)
+    return cluster
+
+
+@pytest.mark.parametrize("suffix", [".json", ".yaml"])
+def test_save_load_round_trip(tmp_path, suffix):
+    cluster = make_cluster()
+    path = tmp_path / f"cluster{suffix}"
+    cluster.save(path)
+
+    loaded = ClusterSpec.load(path)
+
+    assert loaded.nodes == cluster.nodes
+    assert loaded.runtime == cluster.runtime
+    assert loaded.is_online("gpu1")
+    assert not loaded.is_online("nas")
+    assert loaded.utilization("gpu1") == 42.0
+    assert loaded.max_vram_gb("gpu1") == 24.0
+    assert loaded.nodes_with_model("llama") == {"gpu1"}
+    assert loaded.nodes_with_model("llama", healthy=True) == {"gpu1"}
+    assert [n.name for n in loaded.nodes_with_capability(Capability.LLM_INFERENCE)] == ["gpu1"]
+
+
+def test_set_service_healthy_updates_warm_model_index():
+    cluster = make_cluster()
+    changed: list[str] = []
+    cluster.add_listener(changed.append)
+    cluster.add_node(
+        NodeSpec(
+            name="gpu2",
+            host="gpu2.example",
+            services=[
+                ServiceEndpoint(name="vllm", port=8000, models=["llama"]),
+                ServiceEndpoint(name="tgi", port=8080, models=["llama", "mistral"]),
+            ],
+        )
+    )
+    assert cluster.nodes_with_model("llama", healthy=True) == {"gpu1"}
+
+    cluster.set_service_healthy("gpu2", "vllm", True)
+    cluster.set_service_healthy("gpu2", "tgi", True)
+    assert cluster.nodes_with_model("llama", healthy=True) == {"gpu1", "gpu2"}
+    assert cluster.nodes_with_model("mistral", healthy=True) == {"gpu2"}
+
+    cluster.set_service_healthy("gpu2", "vllm", False)  # tgi still serves llama
+    assert cluster.nodes_with_model("llama", healthy=True) == {"gpu1", "gpu2"}
+    cluster.set_service_healthy("gpu2", "tgi", False)
+    assert cluster.nodes_with_model("llama", healthy=True) == {"gpu1"}
+    assert cluster.nodes_with_model("mistral", healthy=True) == frozenset()
+    assert changed.count("gpu2") == 5  # add_node plus four health changes
+
+    cluster.set_service_healthy("gpu1", "vllm", False)
+    cluster.remove_node("nas")  # Rebuilding the indexes keeps runtime health
+    assert cluster.nodes_with_model("llama", healthy=True) == frozenset()
+    with pytest.raises(KeyError):
+        cluster.set_service_healthy("gpu1", "missing", True)
@@ -0,0 +1,104 @@
+import asyncio
+import sys
+from types import ModuleType, SimpleNamespace
+
+from pve_orchestrator.drivers.nvidia import GPUStatus, NvidiaPoller, _query_gpus_nvml
+
+
+class FakeProcess:
+    def __init__(self, stdout: asyncio.StreamReader):
+        self.stdout = stdout
+        self.returncode = 0
+
+
+def run_poller(poller: NvidiaPoller, lines: list[str]) -> None:
+    async def feed() -> None:
+        stdout = asyncio.StreamReader()
+        stdout.feed_data("".join(f"{line}\n" for line in lines).encode())
+        stdout.feed_eof()
+        poller._proc = FakeProcess(stdout)  # type: ignore[assignment]
+        await poller._read_loop()
+
+    asyncio.run(feed())
+
+
+def sample(util: int, unsupported: int | None = None) -> list[str]:
+    return [
+        f"{i}, GPU {i}, {util}, 1, 2, 3, {'[N/A]' if i == unsupported else 4}" for i in range(3)
+    ]
+
+
+def test_unsupported_field_keeps_gpu_in_sample():
+    batches: list[list[GPUStatus]] = []
+    poller = NvidiaPoller(on_update=batches.append)
+    run_poller(poller, sample(0) + sample(1, unsupported=1) + sample(2))
+
+    assert [[g.index for g in b] for b in batches] == [[0, 1, 2]] * 3
+    assert [g.power_draw_w for g in batches[1]] == [4.0, 0.0, 4.0]
+    assert poller._gpu_count == 3
+
+
+def test_malformed_line_does_not_break_batching():
+    batches: list[list[int]] = []
+    poller = NvidiaPoller(on_update=lambda gpus: batches.append([g.index for g in gpus]))
+    garbled = sample(1)
+    garbled[1] = "1, GPU 1, 1, oops, 2, 3, 4"
+    run_poller(poller, sample(0) + garbled + sample(2) + sample(3) + sample(4))
+
+    assert batches == [[0, 1, 2], [0, 2], [0, 1, 2], [0, 1, 2], [0, 1, 2]]
+    assert [g.utilization_pct for g in poller.latest] == [4.0, 4.0, 4.0]
+
+
+def test_callback_error_does_not_stop_reader():
+    calls: list[list[GPUStatus]] = []
+
+    def on_update(gpus: list[GPUStatus]) -> None:
+        calls.append(gpus)
+        raise RuntimeError("boom")
+
+    poller = NvidiaPoller(on_update=on_update)
+    run_poller(poller, sample(0) + sample(1) + sample(2))
+
+    assert len(calls) == 3
+    assert poller.latest[0].utilization_pct == 2.0
+
+
+class NotSupportedError(Exception):
+    pass
+
+
+def fake_pynvml(**getters) -> ModuleType:
+    pynvml = ModuleType("pynvml")
+    pynvml.NVMLError_NotSupported = NotSupportedError  # type: ignore[attr-defined]
+    pynvml.NVML_TEMPERATURE_GPU = 0  # type: ignore[attr-defined]
+    pynvml.nvmlDeviceGetUtilizationRates = lambda h: SimpleNamespace(gpu=50)  # type: ignore[attr-defined]
+    pynvml.nvmlDeviceGetMemoryInfo = lambda h: SimpleNamespace(used=2**30, total=2**31)  # type: ignore[attr-defined]
+    pynvml.nvmlDeviceGetTemperature = lambda h, sensor: 60  # type: ignore[attr-defined]
+    pynvml.nvmlDeviceGetPowerUsage = lambda h: 150_000  # type: ignore[attr-defined]
+    for name, getter in getters.items():
+        setattr(pynvml, name, getter)
+    return pynvml
+
+
+def test_nvml_unsupported_field_reads_as_zero(monkeypatch):
+    def unsupported(*args):
+        raise NotSupportedError
+
+    monkeypatch.setitem(
+        sys.modules,
+        "pynvml",
+        fake_pynvml(nvmlDeviceGetPowerUsage=unsupported, nvmlDeviceGetTemperature=unsupported),
+    )
+
+    [gpu] = _query_gpus_nvml([(object(), "GPU 0")])
+
+    assert (gpu.power_draw_w, gpu.temperature_c) == (0.0, 0.0)
+    assert (gpu.utilization_pct, gpu.memory_used_mb) == (50.0, 1024.0)
+
+
+def test_nvml_reads_all_fields(monkeypatch):
+    monkeypatch.setitem(sys.modules, "pynvml", fake_pynvml())
+
+    [gpu] = _query_gpus_nvml([(object(), "GPU 0")])
+
+    assert (gpu.utilization_pct, gpu.temperature_c, gpu.power_draw_w) == (50.0, 60.0, 150.0)
@@ -0,0 +1,70 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+from pve_orchestrator.drivers.proxmox import AsyncPVEDriver, PVEDriver
+
+
+class FakeAPI:
+    """Stands in for proxmoxer: one VM whose status flips when it is started."""
+
+    def __init__(self) -> None:
+        self.fetches = 0
+        self.status = "stopped"
+        self.release = threading.Event()  # Held fetches block until this is set
+        self.release.set()
+        post = SimpleNamespace(post=self._start)
+        guest = SimpleNamespace(status=SimpleNamespace(start=post))
+        self.cluster = SimpleNamespace(resources=SimpleNamespace(get=self._resources))
+        self.nodes = lambda node: SimpleNamespace(qemu=lambda vmid: guest)
+
+    def _resources(self, **params) -> list[dict]:
+        self.fetches += 1
+        status = self.status
+        self.release.wait(timeout=5)
+        time.sleep(0.01)  # Long enough for concurrent callers to pile up
+        return [{"type": "qemu", "node": "pve1", "vmid": 100, "status": status}]
+
+    def _start(self) -> str:
+        self.status = "running"
+        return "UPID:pve1:start"
+
+
+def make_driver() -> tuple[AsyncPVEDriver, FakeAPI]:
+    api = FakeAPI()
+    driver = PVEDriver("pve.example", "root@pam", "token", "secret")
+    driver._api = api
+    return AsyncPVEDriver(driver), api
+
+
+def test_concurrent_lookups_share_one_fetch():
+    async def run() -> None:
+        driver, api = make_driver()
+        results = await asyncio.gather(*(driver.get_vms("pve1") for _ in range(10)))
+        driver.close()
+        assert api.fetches == 1
+        assert all(r == results[0] for r in results)
+
+    asyncio.run(run())
+
+
+def test_guest_action_during_fetch_is_not_cached():
+    async def run() -> None:
+        driver, api = make_driver()
+        api.release.clear()
+        fetch = asyncio.create_task(driver.get_vms("pve1"))
+        while api.fetches == 0:
+            await asyncio.sleep(0.001)
+
+        await driver.start_vm("pve1", 100)
+        api.release.set()
+        [stale] = await fetch
+        [fresh] = await driver.get_vms("pve1")
+        driver.close()
+
+        assert stale["status"] == "stopped"
+        assert fresh["status"] == "running"
+        assert api.fetches == 2
+
+    asyncio.run(run())
@@ -0,0 +1,292 @@
+import asyncio
+import heapq
+
+import pytest
+
+from pve_orchestrator.core.hardware import (
+    Accelerator,
+    AcceleratorType,
+    Capability,
+    ClusterSpec,
+    NodeSpec,
+    ServiceEndpoint,
+)
+from pve_orchestrator.core.scheduler import Scheduler, TaskQueue
+from pve_orchestrator.core.task import (
+    Task,
+    TaskConstraints,
+    TaskPriority,
+    TaskStatus,
+    make_constraints,
+)
+
+LLM = Capability.LLM_INFERENCE
+
+
+def make_cluster(*names: str) -> ClusterSpec:
+    cluster = ClusterSpec(
+        name="test",
+        proxmox_host="pve.example",
+        nodes=[NodeSpec(name=n, host=f"{n}.example", capabilities=[LLM]) for n in names],
+    )
+    for n in names:
+        cluster.set_online(n, True)
+    return cluster
+
+
+def best(scheduler: Scheduler, **kwargs) -> str | None:
+    node = scheduler._find_best_node(Task(type=LLM, **kwargs))
+    return node.name if node else None
+
+
+def test_set_online_after_construction():
+    cluster = make_cluster("a", "b")
+    scheduler = Scheduler(cluster)
+    cluster.set_online("a", False)
+    cluster.set_online("b", False)
+    assert best(scheduler) is None
+    cluster.set_online("b", True)
+    assert best(scheduler) == "b"
+
+
+def test_added_node_is_routable():
+    cluster = make_cluster()
+    scheduler = Scheduler(cluster)
+    cluster.add_node(NodeSpec(name="c", host="c.example", capabilities=[LLM]))
+    cluster.set_online("c", True)
+    assert best(scheduler) == "c"
+
+
+def test_removed_node_is_not_routable():
+    cluster = make_cluster("a", "b")
+    scheduler = Scheduler(cluster)
+    cluster.update_stats("b", utilization_pct=90)
+    cluster.remove_node("a")
+    assert best(scheduler) == "b"
+    cluster.remove_node("b")
+    assert best(scheduler) is None
+
+
+def test_added_capability_is_routable():
+    cluster = make_cluster("a")
+    scheduler = Scheduler(cluster)
+    task = Task(type=Capability.EMBEDDINGS)
+    assert scheduler._find_best_node(task) is None
+    cluster.add_capability("a", Capability.EMBEDDINGS)
+    assert scheduler._find_best_node(task).name == "a"
+
+
+def test_update_stats_rescores_nodes():
+    cluster = make_cluster("a", "b")
+    scheduler = Scheduler(cluster)
+    cluster.update_stats("a", utilization_pct=95)
+    cluster.update_stats("b", utilization_pct=5)
+    assert best(scheduler) == "b"
+    cluster.update_stats("a", utilization_pct=1)
+    assert best(scheduler) == "a"
+
+
+def test_offline_nodes_are_not_scanned(monkeypatch):
+    cluster = make_cluster(*(f"n{i}" for i in range(200)))
+    scheduler = Scheduler(cluster)
+    for i in range(2, 200):
+        cluster.set_online(f"n{i}", False)
+    cluster.update_stats("n0", utilization_pct=30)
+    cluster.update_stats("n1", utilization_pct=60)
+    assert best(scheduler) == "n0"  # Drops the stale entries left by going offline
+
+    pops = 0
+    heappop = heapq.heappop
+
+    def counting_heappop(heap):
+        nonlocal pops
+        pops += 1
+        return heappop(heap)
+
+    monkeypatch.setattr(heapq, "heappop", counting_heappop)
+    assert best(scheduler) == "n0"
+    assert pops <= 2
+
+    cluster.set_online("n150", True)
+    assert best(scheduler) == "n150"
+
+
+def test_task_queue_orders_by_priority_then_fifo():
+    async def run() -> list[str]:
+        queue = TaskQueue()
+        for label, priority in [
+            ("normal-1", TaskPriority.NORMAL),
+            ("low", TaskPriority.LOW),
+            ("critical", TaskPriority.CRITICAL),
+            ("normal-2", TaskPriority.NORMAL),
+            ("high", TaskPriority.HIGH),
+            ("normal-3", TaskPriority.NORMAL),
+        ]:
+            queue.put(Task(type=LLM, priority=priority, input=label))
+        return [(await queue.get()).input for _ in range(len(queue))]
+
+    assert asyncio.run(run()) == ["critical", "high", "normal-1", "normal-2", "normal-3", "low"]
+
+
+def test_task_queue_task_done_underflow_raises():
+    queue = TaskQueue()
+    with pytest.raises(ValueError):
+        queue.task_done()
+
+
+def test_submit_runs_routed_tasks_on_executor():
+    async def run() -> list[Task]:
+        cluster = make_cluster("a")
+        ran: list[str] = []
+
+        async def executor(task: Task) -> str:
+            ran.append(task.id)
+            return f"done on {task.assigned_node}"
+
+        scheduler = Scheduler(cluster, executor=executor)
+        tasks = [await scheduler.submit(Task(type=LLM)) for _ in range(3)]
+        await scheduler.queue.join()
+        await scheduler.node_queues["a"].join()
+        await scheduler.stop()
+        assert ran == [t.id for t in tasks]
+        return tasks
+
+    for task in asyncio.run(run()):
+        assert task.status == TaskStatus.COMPLETED
+        assert task.result == "done on a"
+        assert task.duration_ms is not None
+
+
+def test_without_executor_routed_tasks_are_not_retained():
+    async def run() -> Task:
+        scheduler = Scheduler(make_cluster("a"))
+        task = await scheduler.submit(Task(type=LLM))
+        await scheduler.queue.join()
+        await scheduler.stop()
+        assert scheduler.node_queues == {}
+        return task
+
+    task = asyncio.run(run())
+    assert task.status == TaskStatus.QUEUED
+    assert task.assigned_node == "a"
+
+
+def test_reassigning_nodes_reindexes_cluster():
+    cluster = make_cluster("a")
+    scheduler = Scheduler(cluster)
+    cluster.nodes = (NodeSpec(name="b", host="b.example", capabilities=[LLM]),)
+    cluster.set_online("b", True)
+    assert cluster.get_node("a") is None
+    assert not cluster.is_online("a")
+    assert best(scheduler) == "b"
+
+
+def test_model_copy_has_independent_indexes():
+    cluster = make_cluster("a")
+    copy = cluster.model_copy()
+    copy.add_node(NodeSpec(name="b", host="b.example"))
+    copy.set_online("a", False)
+    assert cluster.get_node("b") is None
+    assert cluster.is_online("a")
+
+
+def test_nodes_with_capability_keeps_config_order():
+    names = [f"node-{i}" for i in range(20)]
+    cluster = make_cluster(*reversed(names))
+    cluster.set_online("node-3", False)
+    expected = [n for n in reversed(names) if n != "node-3"]
+    assert [n.name for n in cluster.nodes_with_capability(LLM)] == expected
+
+
+def serve(cluster: ClusterSpec, name: str, model: str, healthy: bool = True) -> None:
+    node = cluster.get_node(name)
+    service = ServiceEndpoint(name="vllm", port=8000, models=[model])
+    cluster.add_node(node.model_copy(update={"services": [service]}))
+    cluster.set_service_healthy(name, "vllm", healthy)
+
+
+def test_nodes_with_model_is_immutable():
+    cluster = make_cluster("a")
+    serve(cluster, "a", "llama")
+    assert isinstance(cluster.nodes_with_model("llama"), frozenset)
+    assert isinstance(cluster.nodes_with_model("other", healthy=True), frozenset)
+
+
+def test_require_warm_model_picks_busier_warm_node():
+    cluster = make_cluster("cold", "warm")
+    serve(cluster, "warm", "llama", healthy=False)
+    scheduler = Scheduler(cluster)
+    cluster.update_stats("cold", utilization_pct=5)
+    cluster.update_stats("warm", utilization_pct=90)
+    warm = make_constraints(require_warm_model=True)
+    assert best(scheduler, model="llama") == "cold"
+    assert best(scheduler, model="llama", constraints=warm) == "warm"
+
+
+def test_healthy_warm_node_bonus_beats_idle_cold_node():
+    cluster = make_cluster("cold", "warm")
+    serve(cluster, "warm", "llama")
+    scheduler = Scheduler(cluster)
+    cluster.update_stats("cold", utilization_pct=0)
+    cluster.update_stats("warm", utilization_pct=40)
+    assert best(scheduler, model="llama") == "warm"
+    assert best(scheduler, model="mistral") == "cold"
+    cluster.update_stats("warm", utilization_pct=60)  # Past the bonus
+    assert best(scheduler, model="llama") == "cold"
+
+
+def test_require_warm_model_falls_back_when_warm_nodes_filtered():
+    cluster = make_cluster("cold", "warm")
+    serve(cluster, "warm", "llama")
+    scheduler = Scheduler(cluster)
+    cluster.update_stats("cold", utilization_pct=70)
+    excluded = make_constraints(require_warm_model=True, excluded_nodes=frozenset({"warm"}))
+    assert best(scheduler, model="llama", constraints=excluded) == "cold"
+    cluster.set_online("warm", False)
+    warm = make_constraints(require_warm_model=True)
+    assert best(scheduler, model="llama", constraints=warm) == "cold"
+
+
+def test_excluded_nodes_are_skipped():
+    cluster = make_cluster("a", "b")
+    scheduler = Scheduler(cluster)
+    cluster.update_stats("b", utilization_pct=50)
+    assert best(scheduler) == "a"
+    assert best(scheduler, constraints=make_constraints(excluded_nodes=frozenset({"a"}))) == "b"
+    everything = make_constraints(excluded_nodes=frozenset({"a", "b"}))
+    assert best(scheduler, constraints=everything) is None
+
+
+def test_min_vram_filters_small_gpus():
+    cluster = make_cluster("small", "big")
+    for name, vram in (("small", 8.0), ("big", 48.0)):
+        gpus = [Accelerator(type=AcceleratorType.NVIDIA, model="gpu", vram_gb=vram)]
+        cluster.add_node(cluster.get_node(name).model_copy(update={"accelerators": gpus}))
+    scheduler = Scheduler(cluster)
+    cluster.update_stats("big", utilization_pct=80)
+    assert best(scheduler) == "small"
+    assert best(scheduler, constraints=make_constraints(min_vram_gb=24)) == "big"
+    assert best(scheduler, constraints=make_constraints(min_vram_gb=96)) is None
+
+
+def test_preferred_node_wins_when_usable():
+    cluster = make_cluster("a", "b")
+    scheduler = Scheduler(cluster)
+    cluster.update_stats("b", utilization_pct=90)
+    prefer_b = make_constraints(preferred_node="b")
+    assert best(scheduler, constraints=prefer_b) == "b"
+    cluster.set_online("b", False)
+    assert best(scheduler, constraints=prefer_b) == "a"
+    assert best(scheduler, constraints=make_constraints(preferred_node="missing")) == "a"
+
+
+def test_equal_constraints_share_compiled_filter():
+    cluster = make_cluster("a", "b")
+    scheduler = Scheduler(cluster)
+    first = TaskConstraints(excluded_nodes=frozenset({"a"}), min_vram_gb=None)
+    second = TaskConstraints(excluded_nodes=frozenset({"a"}))
+    assert first is not second
+    assert best(scheduler, constraints=first) == "b"
+    assert best(scheduler, constraints=second) == "b"
+    accepts = scheduler._compile_filter(frozenset({"a"}), None)
+    assert list(scheduler._filters.values()) == [accepts]
@@ -0,0 +1,24 @@
+from datetime import datetime
+
+from pve_orchestrator.core.hardware import Capability
+from pve_orchestrator.core.task import Task
+
+
+def test_created_at_is_serialized():
+    task = Task(type=Capability.LLM_INFERENCE)
+    dumped = task.model_dump()
+    assert dumped["created_at"] == task.created_at
+    assert dumped["created_at"].tzinfo is not None
+
+    restored = Task.model_validate_json(task.model_dump_json())
+    assert restored.created_at == task.created_at
+    assert isinstance(restored.created_at, datetime)
+
+
+def test_monotonic_timestamps_are_not_serialized():
+    task = Task(type=Capability.LLM_INFERENCE, started_at_ns=1_000_000, completed_at_ns=3_500_000)
+    dumped = task.model_dump()
+    assert "started_at_ns" not in dumped
+    assert "completed_at_ns" not in dumped
+    assert dumped["duration_ms"] == 2.5
+    assert Task(type=Capability.LLM_INFERENCE).model_dump()["duration_ms"] is None